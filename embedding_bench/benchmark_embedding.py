@@ -6,18 +6,39 @@ Measures throughput and latency across combinations of batch size and concurrenc
 """
 
 import argparse
+import array
 import asyncio
+import gzip
+import itertools
 import json
+import multiprocessing
+import os
+import tempfile
 import time
-import random
 import string
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 import atexit
 import threading
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
 
 import aiohttp
+import numpy as np
+
+from result_naming import model_slug as to_model_slug, result_filename
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None  # type: ignore[assignment]
+
+try:
+    import uvloop as _uvloop
+except ImportError:
+    _uvloop = None  # type: ignore[assignment]
 
 try:
     import pynvml as _pynvml
@@ -34,14 +55,16 @@ class PowerMonitor:
     def __init__(self, poll_interval: float = 0.1) -> None:
         self._poll_interval = poll_interval
         self._stop_event = threading.Event()
-        self._samples: list[float] = []
+        self._times = array.array("d")
+        self._watts = array.array("d")
         self._thread: Optional[threading.Thread] = None
 
     def start(self) -> None:
         if not _NVML_AVAILABLE:
             return
         self._stop_event.clear()
-        self._samples = []
+        self._times = array.array("d")
+        self._watts = array.array("d")
         self._thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._thread.start()
 
@@ -51,14 +74,60 @@ class PowerMonitor:
             handles = [_pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(num_gpus)]
         except Exception:
             return
-        while not self._stop_event.wait(timeout=self._poll_interval):
+        # Instantaneous power comes from one field-values call per GPU where the
+        # driver supports it (older pynvml builds lack the field id). Each handle
+        # is probed once up front so unsupported GPUs don't pay for two calls per
+        # poll; nvmlDeviceGetPowerUsage stays as the per-GPU fallback on errors.
+        field_id = getattr(_pynvml, "NVML_FI_DEV_POWER_INSTANT", None)
+
+        def read_instant_mw(handle: Any) -> float:
+            (value,) = _pynvml.nvmlDeviceGetFieldValues(handle, [field_id])
+            if value.nvmlReturn != _pynvml.NVML_SUCCESS:
+                raise RuntimeError(f"NVML field query failed ({value.nvmlReturn})")
+            return value.value.uiVal
+
+        readers: list[Callable[[Any], float]] = []
+        for handle in handles:
+            reader: Callable[[Any], float] = _pynvml.nvmlDeviceGetPowerUsage
+            if field_id is not None:
+                try:
+                    read_instant_mw(handle)
+                    reader = read_instant_mw
+                except Exception:
+                    pass
+            readers.append(reader)
+
+        def read_watts() -> Optional[float]:
             total_mw: float = 0.0
-            for handle in handles:
+            read_any = False
+            for handle, reader in zip(handles, readers):
                 try:
-                    total_mw += _pynvml.nvmlDeviceGetPowerUsage(handle)
+                    total_mw += reader(handle)
+                    read_any = True
                 except Exception:
-                    pass  # skip GPUs without power sensor
-            self._samples.append(total_mw / 1000.0)  # mW -> W
+                    if reader is _pynvml.nvmlDeviceGetPowerUsage:
+                        continue  # no sensor; there is nothing to fall back to
+                    try:
+                        total_mw += _pynvml.nvmlDeviceGetPowerUsage(handle)
+                        read_any = True
+                    except Exception:
+                        pass  # skip GPUs without power sensor
+            # No GPU reported power: record nothing rather than a fake 0 W
+            return total_mw / 1000.0 if read_any else None  # mW -> W
+
+        # Poll on absolute deadlines so the period does not drift by the time each
+        # query takes, and bracket the window with samples at start and stop.
+        next_t = time.monotonic()
+        while True:
+            t = time.monotonic()
+            watts = read_watts()
+            if watts is not None:
+                self._times.append(t)
+                self._watts.append(watts)
+            if self._stop_event.is_set():
+                return
+            next_t += self._poll_interval
+            self._stop_event.wait(timeout=max(0.0, next_t - time.monotonic()))
 
     def stop(self) -> Optional[dict]:
         if not _NVML_AVAILABLE or self._thread is None:
@@ -66,22 +135,120 @@ class PowerMonitor:
         self._stop_event.set()
         self._thread.join(timeout=2.0)
         self._thread = None
-        if not self._samples:
+        if len(self._watts) < 2:
+            return None
+        t = np.array(self._times, dtype=np.float64)
+        w = np.array(self._watts, dtype=np.float64)
+        duration = float(t[-1] - t[0])
+        if duration <= 0:
             return None
-        return {"power_avg_w": sum(self._samples) / len(self._samples)}
+        # Trapezoidal integration of the (timestamp, watts) samples
+        energy_j = float(np.sum((w[1:] + w[:-1]) * np.diff(t)) / 2.0)
+        return {"power_avg_w": energy_j / duration, "energy_j": energy_j}
 
 
-def generate_text(num_tokens: int) -> str:
+def encode_json(obj: object, indent: bool = False) -> bytes:
+    """Serialize `obj` to JSON bytes, using orjson when available.
+    Output is compact unless `indent` is set (two-space indentation).
+    """
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(data: bytes) -> object:
+    """Parse JSON bytes, using orjson when available."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+_LETTERS = np.frombuffer(string.ascii_lowercase.encode("ascii"), dtype=np.uint8)
+_SPACE = ord(" ")
+_CORPUS_SEED = 42
+
+
+def generate_text(rng: np.random.Generator, num_tokens: int) -> str:
     """Generate synthetic text of approximately `num_tokens` tokens.
     Uses simple word-like tokens (~5 chars each) to approximate tokenizer output.
     """
     words_needed = max(1, num_tokens)
-    words = []
-    for _ in range(words_needed):
-        length = random.randint(3, 8)
-        word = "".join(random.choices(string.ascii_lowercase, k=length))
-        words.append(word)
-    return " ".join(words)
+    lengths = rng.integers(3, 9, size=words_needed)
+    # Offset just past each word's trailing separator; the last one is dropped.
+    ends = np.cumsum(lengths + 1)
+    buf = _LETTERS[rng.integers(0, len(_LETTERS), size=int(ends[-1]), dtype=np.uint8)]
+    buf[ends - 1] = _SPACE
+    return buf[:-1].tobytes().decode("ascii")
+
+
+def iter_corpus_batches(
+    chunk_size: int, batch_size: int, num_batches: int
+) -> Iterator[list[str]]:
+    """Yield `num_batches` lists of `batch_size` synthetic texts of `chunk_size` tokens.
+
+    The generator is seeded from `chunk_size` alone, so a given chunk size always
+    yields the same stream of texts (for any batch size, the batches are
+    consecutive slices of it) regardless of sweep order or which process builds it.
+    """
+    rng = np.random.default_rng([_CORPUS_SEED, chunk_size])
+    for _ in range(num_batches):
+        yield [generate_text(rng, chunk_size) for _ in range(batch_size)]
+
+
+def build_payloads(
+    model: str,
+    chunk_size: int,
+    batch_size: int,
+    num_requests: int,
+    encoding_format: str = "float",
+) -> tuple[str, list[int]]:
+    """Encode one request body per batch into a temp file; return (path, body sizes).
+
+    Runs in a worker process ahead of the sweep point using it. Bodies are
+    streamed to disk one at a time, so neither the whole corpus nor a payload
+    list crosses the pool pipe; the parent loads them with `read_payloads`
+    between sweep points, never while one is being timed.
+    """
+    fd, path = tempfile.mkstemp(prefix="hw_bench_payloads_", suffix=".bin")
+    sizes = []
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for texts in iter_corpus_batches(chunk_size, batch_size, num_requests):
+                body = encode_json(
+                    {"model": model, "input": texts, "encoding_format": encoding_format}
+                )
+                f.write(body)
+                sizes.append(len(body))
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, sizes
+
+
+def read_payloads(path: str, sizes: list[int]) -> list[bytes]:
+    """Load the request bodies written by `build_payloads` and delete the file."""
+    try:
+        with open(path, "rb") as f:
+            return [f.read(n) for n in sizes]
+    finally:
+        os.unlink(path)
+
+
+def build_warmup_payload(model: str, chunk_size: int, encoding_format: str) -> bytes:
+    """Encode a one-text request body that never appears in the measured corpus.
+    Drawn from a separate seed stream so server-side prefix caching can't turn
+    the first measured requests into warm hits.
+    """
+    rng = np.random.default_rng([_CORPUS_SEED, chunk_size, 1])
+    return encode_json(
+        {
+            "model": model,
+            "input": [generate_text(rng, chunk_size)],
+            "encoding_format": encoding_format,
+        }
+    )
 
 
 async def fetch_max_model_len(base_url: str, model: str) -> Optional[int]:
@@ -92,7 +259,7 @@ async def fetch_max_model_len(base_url: str, model: str) -> Optional[int]:
             async with session.get(url) as resp:
                 if resp.status != 200:
                     return None
-                data = await resp.json()
+                data = decode_json(await resp.read())
                 for entry in data.get("data", []):
                     if entry.get("id") == model:
                         return entry.get("max_model_len")
@@ -102,61 +269,168 @@ async def fetch_max_model_len(base_url: str, model: str) -> Optional[int]:
 
 
 async def post_embeddings(
-    session: aiohttp.ClientSession,
-    base_url: str,
-    model: str,
-    texts: list[str],
-) -> float:
-    """Post a single embedding request and return wall-clock latency in ms."""
-    url = f"{base_url}/v1/embeddings"
-    payload = {"model": model, "input": texts}
+    post: Callable[..., Any],
+    url: str,
+    headers: dict[str, str],
+    body: bytes,
+    validate: bool = False,
+) -> tuple[float, float]:
+    """Post a pre-encoded embedding request and return its (sent_at, received_at)
+    `time.perf_counter()` timestamps, taken before sending and after draining.
+
+    `post` is a session's bound `post` method; `url` and `headers` are built once
+    per sweep point by the caller. The response body is drained without being
+    parsed; pass `validate=True` to parse it and check that it holds an
+    embeddings list.
+    """
     t0 = time.perf_counter()
-    async with session.post(url, json=payload) as resp:
+    async with post(url, data=body, headers=headers) as resp:
         resp.raise_for_status()
-        await resp.json()
-    return (time.perf_counter() - t0) * 1000.0
+        if validate:
+            raw = await resp.read()
+            # The session disables auto-decompression, so undo gzip by hand here
+            if resp.headers.get("Content-Encoding", "").lower() == "gzip":
+                raw = gzip.decompress(raw)
+            data = decode_json(raw)
+            if not isinstance(data, dict) or not isinstance(data.get("data"), list):
+                raise ValueError(f"Unexpected embeddings response from {url}")
+        else:
+            async for _ in resp.content.iter_chunked(65536):
+                pass
+    return t0, time.perf_counter()
+
+
+# Adaptive early termination compares consecutive, non-overlapping windows of
+# this many completed requests, so it needs at least twice as many requests.
+_ADAPTIVE_WINDOW = 50
 
 
 async def run_sweep_point(
     base_url: str,
     model: str,
+    bodies: list[bytes],
     chunk_size: int,
     batch_size: int,
     concurrency: int,
     num_requests: int,
     framework: str = "vllm",
+    encoding_format: str = "float",
+    latencies_path: Optional[Path] = None,
+    adaptive: bool = False,
 ) -> dict:
-    """Run one (batch_size, concurrency) sweep point and return metrics."""
-    # Pre-generate all text batches
-    batches = [
-        [generate_text(chunk_size) for _ in range(batch_size)]
-        for _ in range(num_requests)
-    ]
+    """Run one (batch_size, concurrency) sweep point and return metrics.
 
-    latencies_ms: list[float] = []
-    sem = asyncio.Semaphore(concurrency)
+    `bodies` are the pre-encoded request payloads from `build_payloads`, so JSON
+    encoding stays off the timed path. If `latencies_path` is given, the raw
+    per-request latencies and send/receive times (seconds from the start of the
+    measured window) are saved there with `np.savez_compressed`.
 
-    async def bounded_request(texts: list[str], session: aiohttp.ClientSession) -> None:
-        async with sem:
-            lat = await post_embeddings(session, base_url, model, texts)
-            latencies_ms.append(lat)
+    With `adaptive`, the point stops dispatching new requests once the median
+    latency of a window of 50 completions is within 2% of the previous,
+    non-overlapping window's; requests already in flight still finish.
+    """
+    url = f"{base_url}/v1/embeddings"
+    # Ask for gzip but never inflate it (see the session below): drained bodies
+    # are only counted, so a compressing server moves 5-10x fewer bytes.
+    headers = {
+        "Content-Type": "application/json",
+        "Accept-Encoding": "gzip",
+        "Connection": "keep-alive",
+    }
+
+    sent_at = np.empty(num_requests, dtype=np.float64)
+    received_at = np.empty(num_requests, dtype=np.float64)
+    idx = itertools.count()
+    window: list[float] = []
+    prev_median: Optional[float] = None
+    adaptive_stopped_at: Optional[int] = None
+    queue: asyncio.Queue[bytes] = asyncio.Queue()
+    for body in bodies:
+        queue.put_nowait(body)
+
+    # A fixed pool of `concurrency` workers bounds the in-flight requests
+    async def worker(session: aiohttp.ClientSession) -> None:
+        nonlocal prev_median, adaptive_stopped_at
+        post = session.post
+        while adaptive_stopped_at is None:
+            try:
+                body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            t0, t1 = await post_embeddings(post, url, headers, body)
+            i = next(idx)
+            sent_at[i] = t0
+            received_at[i] = t1
+            # Requests still in flight after the rule fired must not re-fire it
+            if not adaptive or adaptive_stopped_at is not None:
+                continue
+            window.append(t1 - t0)
+            if len(window) == _ADAPTIVE_WINDOW:
+                median = float(np.median(window))
+                window.clear()
+                if prev_median and abs(median - prev_median) / prev_median < 0.02:
+                    adaptive_stopped_at = i + 1
+                prev_median = median
 
     monitor = PowerMonitor(poll_interval=0.1)
-    connector = aiohttp.TCPConnector(limit=concurrency + 4)
+    connector = aiohttp.TCPConnector(
+        limit=concurrency,
+        limit_per_host=concurrency,
+        keepalive_timeout=300,
+        enable_cleanup_closed=True,
+        force_close=False,
+    )
     timeout = aiohttp.ClientTimeout(total=300)
-    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        auto_decompress=False,
+    ) as session:
+        # Warm up one pooled connection per worker so no measured request pays
+        # for a handshake. The first warmup response is parsed as a schema check.
+        warmup_body = build_warmup_payload(model, chunk_size, encoding_format)
+        await asyncio.gather(
+            *[
+                post_embeddings(
+                    session.post, url, headers, warmup_body, validate=(i == 0)
+                )
+                for i in range(concurrency)
+            ]
+        )
         monitor.start()
         t_start = time.perf_counter()
         try:
-            await asyncio.gather(*[bounded_request(b, session) for b in batches])
+            await asyncio.gather(*[worker(session) for _ in range(concurrency)])
         finally:
-            elapsed = time.perf_counter() - t_start
+            t_end = time.perf_counter()
+            elapsed = t_end - t_start
             power_stats = monitor.stop()
 
-    completed = len(latencies_ms)
-    latencies_ms.sort()
-    p50 = latencies_ms[int(completed * 0.50) - 1] if completed else 0.0
-    p99 = latencies_ms[int(completed * 0.99) - 1] if completed else 0.0
+    completed = next(idx)
+    sent_at = sent_at[:completed]
+    received_at = received_at[:completed]
+    latencies_ms = (received_at - sent_at) * 1000.0
+    if completed:
+        p50, p95, p99, p999 = (
+            float(p) for p in np.percentile(latencies_ms, [50, 95, 99, 99.9])
+        )
+    else:
+        p50 = p95 = p99 = p999 = 0.0
+    if latencies_path is not None:
+        np.savez_compressed(
+            latencies_path,
+            latencies_ms=latencies_ms,
+            sent_at_s=sent_at - t_start,
+            received_at_s=received_at - t_start,
+        )
+
+    # Little's law: time-averaged number of requests in flight over the window
+    in_flight_s = np.clip(received_at, t_start, t_end) - np.clip(sent_at, t_start, t_end)
+    effective_concurrency = float(in_flight_s.sum()) / elapsed if elapsed > 0 else 0.0
+    # Requests sent during each 1-second interval of the measured window
+    send_rate_per_sec = (
+        np.bincount((sent_at - t_start).astype(np.int64)).tolist() if completed else []
+    )
 
     total_embeddings = completed * batch_size
     throughput = total_embeddings / elapsed if elapsed > 0 else 0.0
@@ -168,13 +442,14 @@ async def run_sweep_point(
 
     if power_stats is not None:
         power_avg_w = round(power_stats["power_avg_w"], 2)
-        energy_joules = round(power_stats["power_avg_w"] * elapsed, 2)
+        energy_joules = round(power_stats["energy_j"], 2)
         if energy_joules and energy_joules > 0:
             emb_per_joule = round(total_embeddings / energy_joules, 4)
 
     return {
         "model": model,
         "framework": framework,
+        "encoding_format": encoding_format,
         "chunk_size": chunk_size,
         "batch_size": batch_size,
         "concurrency": concurrency,
@@ -182,9 +457,14 @@ async def run_sweep_point(
         "completed_requests": completed,
         "elapsed_sec": round(elapsed, 3),
         "p50_latency_ms": round(p50, 2),
+        "p95_latency_ms": round(p95, 2),
         "p99_latency_ms": round(p99, 2),
+        "p999_latency_ms": round(p999, 2),
         "throughput_emb_per_sec": round(throughput, 2),
         "throughput_per_user": round(throughput_per_user, 2),
+        "effective_concurrency": round(effective_concurrency, 3),
+        "send_rate_per_sec": send_rate_per_sec,
+        "adaptive_stopped_at": adaptive_stopped_at,
         "power_avg_w": power_avg_w,
         "energy_joules": energy_joules,
         "emb_per_joule": emb_per_joule,
@@ -216,21 +496,45 @@ async def main() -> None:
     parser.add_argument(
         "--framework", default="vllm", help="Inference framework (vllm, sglang)"
     )
+    parser.add_argument(
+        "--encoding-format",
+        choices=["float", "base64"],
+        default="float",
+        help="Embedding response encoding. base64 shrinks responses ~3x and cuts "
+        "server-side serialization, so its results are not comparable with float",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help=f"Stop a sweep point early once median latency stabilizes (<2%% change "
+        f"between consecutive {_ADAPTIVE_WINDOW}-request windows; needs --num-requests "
+        f">= {2 * _ADAPTIVE_WINDOW}); off by default for reproducibility",
+    )
     parser.add_argument("--result-dir", default="../results", help="Output directory")
     parser.add_argument(
         "--force",
         action="store_true",
         help="Re-run and overwrite existing result files",
     )
+    parser.add_argument(
+        "--save-latencies",
+        action="store_true",
+        help="Also save raw per-request latencies to a .npz next to each result",
+    )
     args = parser.parse_args()
 
+    if args.adaptive and args.num_requests < 2 * _ADAPTIVE_WINDOW:
+        print(
+            f"  WARNING: --adaptive needs --num-requests >= {2 * _ADAPTIVE_WINDOW} "
+            f"(got {args.num_requests}); no sweep point can stop early.",
+            flush=True,
+        )
+
     batch_sizes = parse_int_list(args.batch_sizes)
     concurrencies = parse_int_list(args.concurrencies)
     result_dir = Path(args.result_dir)
     result_dir.mkdir(parents=True, exist_ok=True)
 
-    random.seed(42)
-
     # Fetch the model's max sequence length and compute a safe word cap.
     # Uses 5 tokens/word as a conservative upper bound for subword tokenizers.
     # This prevents 400 errors when random words tokenize above the model's limit.
@@ -247,52 +551,131 @@ async def main() -> None:
             )
             args.chunk_size = max_safe_words
 
-    model_slug = args.model.replace("/", "_")
+    model_slug = to_model_slug(args.model)
     skipped = 0
     ran = 0
     errors = 0
+    pending: list[tuple[int, list[int]]] = []
     for batch_size in batch_sizes:
+        todo = []
         for concurrency in concurrencies:
-            fname = f"{model_slug}__chunk{args.chunk_size}__bs{batch_size}__conc{concurrency}.json"
-            out_path = result_dir / fname
-            if out_path.exists() and not args.force:
+            fname = result_filename(
+                model_slug, args.chunk_size, batch_size, concurrency, args.encoding_format
+            )
+            if (result_dir / fname).exists() and not args.force:
                 print(
                     f"  Skipping {fname} (already exists, use --force to re-run)",
                     flush=True,
                 )
                 skipped += 1
                 continue
-            print(
-                f"  chunk={args.chunk_size} batch={batch_size} concurrency={concurrency} ...",
-                flush=True,
-            )
+            todo.append(concurrency)
+        if todo:
+            pending.append((batch_size, todo))
+
+    # Payloads for the next batch size are built in a worker process while the
+    # current one is being measured. "spawn" avoids forking the NVML poll thread.
+    # They are read back from disk only between batch sizes, so the transfer never
+    # competes with a timed sweep point and at most one payload list is resident.
+    def new_pool() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    pool = new_pool()
+
+    def prefetch(batch_size: int) -> concurrent.futures.Future:
+        nonlocal pool
+        build_args = (
+            build_payloads,
+            args.model,
+            args.chunk_size,
+            batch_size,
+            args.num_requests,
+            args.encoding_format,
+        )
+        try:
+            return pool.submit(*build_args)
+        except BrokenProcessPool:
+            # The worker died building earlier payloads (e.g. OOM-killed); that
+            # batch size is reported as failed, the remaining ones get a new pool.
+            pool.shutdown(wait=False)
+            pool = new_pool()
+            return pool.submit(*build_args)
+
+    next_build: Optional[concurrent.futures.Future] = None
+    try:
+        next_build = prefetch(pending[0][0]) if pending else None
+        for n, (batch_size, todo) in enumerate(pending):
+            payload_error: Optional[Exception] = None
             try:
-                result = await run_sweep_point(
-                    base_url=args.base_url,
-                    model=args.model,
-                    chunk_size=args.chunk_size,
-                    batch_size=batch_size,
-                    concurrency=concurrency,
-                    num_requests=args.num_requests,
-                    framework=args.framework,
+                bodies = read_payloads(*await asyncio.wrap_future(next_build))
+            except Exception as e:
+                bodies, payload_error = [], e
+            next_build = prefetch(pending[n + 1][0]) if n + 1 < len(pending) else None
+            for concurrency in todo:
+                fname = result_filename(
+                    model_slug, args.chunk_size, batch_size, concurrency, args.encoding_format
                 )
-                with open(out_path, "w") as f:
-                    json.dump(result, f, indent=2)
+                out_path = result_dir / fname
                 print(
-                    f"    -> p50={result['p50_latency_ms']}ms  p99={result['p99_latency_ms']}ms  "
-                    f"tput={result['throughput_emb_per_sec']} emb/s  saved {out_path.name}",
+                    f"  chunk={args.chunk_size} batch={batch_size} concurrency={concurrency} ...",
                     flush=True,
                 )
-                ran += 1
-            except Exception as e:
-                print(f"    ERROR: {e}", flush=True)
-                error_path = result_dir / f"{fname}.error"
-                error_path.write_text(str(e))
-                errors += 1
+                try:
+                    if payload_error is not None:
+                        raise payload_error
+                    result = await run_sweep_point(
+                        base_url=args.base_url,
+                        model=args.model,
+                        bodies=bodies,
+                        chunk_size=args.chunk_size,
+                        batch_size=batch_size,
+                        concurrency=concurrency,
+                        num_requests=args.num_requests,
+                        framework=args.framework,
+                        encoding_format=args.encoding_format,
+                        adaptive=args.adaptive,
+                        latencies_path=(
+                            out_path.with_suffix(".npz") if args.save_latencies else None
+                        ),
+                    )
+                    with open(out_path, "wb") as f:
+                        f.write(encode_json(result, indent=True))
+                    # Also append to the per-model JSONL: process_results.py streams
+                    # it and only opens the per-point files it doesn't cover.
+                    with open(result_dir / f"{model_slug}.jsonl", "ab") as f:
+                        f.write(encode_json(result) + b"\n")
+                    print(
+                        f"    -> p50={result['p50_latency_ms']}ms  p99={result['p99_latency_ms']}ms  "
+                        f"tput={result['throughput_emb_per_sec']} emb/s  saved {out_path.name}",
+                        flush=True,
+                    )
+                    ran += 1
+                except Exception as e:
+                    print(f"    ERROR: {e}", flush=True)
+                    error_path = result_dir / f"{fname}.error"
+                    error_path.write_text(str(e))
+                    errors += 1
+            bodies = []  # release before the next batch size's payloads are read
+    finally:
+        # On an early exit (Ctrl-C, unexpected error) a build may still be queued
+        # or running: cancel or wait for it, then remove its multi-GB temp file.
+        pool.shutdown(wait=True, cancel_futures=True)
+        if (
+            next_build is not None
+            and not next_build.cancelled()
+            and next_build.exception() is None
+        ):
+            Path(next_build.result()[0]).unlink(missing_ok=True)
     print(f"  Summary: ran={ran} skipped={skipped} errors={errors}", flush=True)
     if errors and ran == 0:
         raise SystemExit(1)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop.run() only exists in uvloop >= 0.18; older versions use asyncio.run()
+    if _uvloop is not None and hasattr(_uvloop, "run"):
+        _uvloop.run(main())
+    else:
+        asyncio.run(main())
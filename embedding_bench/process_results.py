@@ -9,22 +9,128 @@ Usage:
 
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from result_naming import ENCODING_SUFFIXES, model_slug, result_filename
 
-def load_results(results_dir: Path, hardware_override: str | None) -> list[dict]:
-    """Walk results_dir, load all *.json files (skip server.log and summary.json)."""
-    records = []
-    for json_file in sorted(results_dir.rglob("*.json")):
-        if json_file.name in ("summary.json",):
-            continue
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None  # type: ignore[assignment]
+
+
+def encode_json_indented(obj: object) -> bytes:
+    """Serialize `obj` to two-space indented JSON bytes, using orjson when available."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def decode_json(data: bytes) -> object:
+    """Parse JSON bytes, using orjson when available."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def _point_key(data: dict) -> tuple:
+    """Identify the sweep point a record belongs to."""
+    return (
+        data.get("model"),
+        data.get("encoding_format", "float"),
+        data.get("chunk_size"),
+        data.get("batch_size"),
+        data.get("concurrency"),
+    )
+
+
+def _load_one(json_file: Path) -> list[dict]:
+    """Read and parse one result file, or warn and return [] if unreadable.
+
+    A *.jsonl file holds one record per line, appended as each sweep point
+    finishes; unparseable lines (e.g. a truncated final append) are skipped
+    individually.
+    """
+    try:
+        raw = json_file.read_bytes()
+    except OSError as e:
+        print(f"Warning: skipping {json_file}: {e}")
+        return []
+    if json_file.suffix != ".jsonl":
         try:
-            with open(json_file) as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, OSError) as e:
+            return [decode_json(raw)]
+        except json.JSONDecodeError as e:
             print(f"Warning: skipping {json_file}: {e}")
+            return []
+    records = []
+    for lineno, line in enumerate(raw.splitlines(), start=1):
+        if not line.strip():
             continue
+        try:
+            records.append(decode_json(line))
+        except json.JSONDecodeError as e:
+            print(f"Warning: skipping {json_file}:{lineno}: {e}")
+    return records
+
+
+def _covered_filename(data: object) -> str | None:
+    """Per-point result filename for a JSONL record, or None if it can't be named."""
+    if not isinstance(data, dict):
+        return None
+    try:
+        encoding_format = data.get("encoding_format", "float")
+        if encoding_format not in ENCODING_SUFFIXES:
+            return None
+        return result_filename(
+            model_slug(data["model"]),
+            data["chunk_size"],
+            data["batch_size"],
+            data["concurrency"],
+            encoding_format,
+        )
+    except (KeyError, AttributeError):
+        return None
 
+
+def load_results(results_dir: Path, hardware_override: str | None) -> list[dict]:
+    """Walk results_dir and load every result record (skip server.log and summary.json).
+
+    Per-model *.jsonl files are streamed first; per-point *.json files are only
+    opened for points no JSONL record covers: points skipped on a resumed run,
+    results predating the JSONL, a JSONL with a truncated line, or one that
+    `rsync --ignore-existing` stopped refreshing. Within a JSONL, the last line
+    for a re-run point wins.
+    """
+    jsonl_files = sorted(results_dir.rglob("*.jsonl"))
+    # Read and parse in parallel; hardware/framework inference stays serial below
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        jsonl_loaded = list(ex.map(_load_one, jsonl_files))
+        covered = {
+            jsonl_file.parent / name
+            for jsonl_file, file_records in zip(jsonl_files, jsonl_loaded)
+            for name in map(_covered_filename, file_records)
+            if name is not None
+        }
+        json_files = [
+            p
+            for p in sorted(results_dir.rglob("*.json"))
+            if p.name not in ("summary.json",) and p not in covered
+        ]
+        json_loaded = list(ex.map(_load_one, json_files))
+
+    # JSONL records go last, so they overwrite any per-point JSON for the same point
+    merged: dict[tuple, tuple[Path, dict]] = {}
+    for result_file, file_records in zip(
+        json_files + jsonl_files, json_loaded + jsonl_loaded
+    ):
+        for data in file_records:
+            if isinstance(data, dict):
+                merged[(result_file.parent, *_point_key(data))] = (result_file, data)
+    entries = list(merged.values())
+
+    records = []
+    for json_file, data in entries:
         # Infer hardware and framework from directory name pattern:
         # <model_slug>__<hardware> or <model_slug>__<hardware>__<framework>
         hardware = hardware_override
@@ -54,6 +160,7 @@ def sort_key(r: dict) -> tuple:
         r.get("model", ""),
         r.get("hardware", ""),
         r.get("framework", ""),
+        r.get("encoding_format", "float"),
         r.get("chunk_size", 0),
         r.get("batch_size", 0),
         r.get("concurrency", 0),
@@ -65,6 +172,7 @@ def print_markdown_table(records: list[dict]) -> None:
         "Model",
         "Hardware",
         "Framework",
+        "Encoding",
         "Chunk",
         "Batch",
         "Conc",
@@ -86,6 +194,7 @@ def print_markdown_table(records: list[dict]) -> None:
             model_short,
             r.get("hardware", ""),
             r.get("framework", ""),
+            r.get("encoding_format", "float"),
             str(r.get("chunk_size", "")),
             str(r.get("batch_size", "")),
             str(r.get("concurrency", "")),
@@ -97,10 +206,9 @@ def print_markdown_table(records: list[dict]) -> None:
             emb_per_joule_str,
         ])
 
-    col_widths = [len(h) for h in headers]
-    for row in rows:
-        for i, cell in enumerate(row):
-            col_widths[i] = max(col_widths[i], len(cell))
+    col_widths = [
+        max([len(h), *(len(row[i]) for row in rows)]) for i, h in enumerate(headers)
+    ]
 
     def fmt_row(cells: list[str]) -> str:
         return "| " + " | ".join(c.ljust(col_widths[i]) for i, c in enumerate(cells)) + " |"
@@ -133,8 +241,8 @@ def main() -> None:
     records.sort(key=sort_key)
 
     out_path = Path(args.output) if args.output else results_dir / "summary.json"
-    with open(out_path, "w") as f:
-        json.dump(records, f, indent=2)
+    with open(out_path, "wb") as f:
+        f.write(encode_json_indented(records))
     print(f"Wrote {len(records)} records to {out_path}\n")
 
     print_markdown_table(records)
@@ -0,0 +1,23 @@
+"""
+Per-sweep-point result file naming, shared by benchmark_embedding.py (writer)
+and process_results.py (reader). run_sweep.sh mirrors it in its existence checks.
+"""
+
+# Non-default encodings get their own result files so they never shadow or
+# overwrite float results.
+ENCODING_SUFFIXES = {"float": "", "base64": "__b64"}
+
+
+def model_slug(model: str) -> str:
+    return model.replace("/", "_")
+
+
+def result_filename(
+    model_slug: str,
+    chunk_size: int,
+    batch_size: int,
+    concurrency: int,
+    encoding_format: str = "float",
+) -> str:
+    suffix = ENCODING_SUFFIXES[encoding_format]
+    return f"{model_slug}__chunk{chunk_size}__bs{batch_size}__conc{concurrency}{suffix}.json"
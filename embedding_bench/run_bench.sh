@@ -38,6 +38,10 @@ HF_TOKEN=${HF_TOKEN:?HF_TOKEN is required}
 HARDWARE=${HARDWARE:-unknown}
 FRAMEWORK=${FRAMEWORK:-"vllm"}          # vllm | sglang
 FORCE=${FORCE:-false}
+ENCODING_FORMAT=${ENCODING_FORMAT:-"float"}  # float | base64 (smaller responses)
+SAVE_LATENCIES=${SAVE_LATENCIES:-false}  # also write raw per-request latencies (.npz)
+ADAPTIVE=${ADAPTIVE:-false}              # stop sweep points early once latency stabilizes
+                                         # (needs NUM_REQUESTS >= 100 to ever trigger)
 CHUNK_SIZES=${CHUNK_SIZES:-"256,512"}
 BATCH_SIZES=${BATCH_SIZES:-"1,4,16,64,256,512,1024,2048,4096,8192,16384,32768"}
 CONCURRENCIES=${CONCURRENCIES:-"1,4"}
@@ -56,6 +60,7 @@ echo "=== Embedding Benchmark ==="
 echo "Model:       $MODEL"
 echo "Hardware:    $HARDWARE"
 echo "Framework:   $FRAMEWORK"
+echo "Encoding:    $ENCODING_FORMAT"
 echo "Result dir:  $RESULT_DIR"
 echo ""
 
@@ -113,8 +118,11 @@ for CHUNK_SIZE in ${CHUNK_SIZES//,/ }; do
         --concurrencies "$CONCURRENCIES" \
         --num-requests "$NUM_REQUESTS" \
         --framework "$FRAMEWORK" \
+        --encoding-format "$ENCODING_FORMAT" \
         --result-dir "$RESULT_DIR" \
-        $( [[ "$FORCE" == "true" ]] && echo "--force" ); then
+        $( [[ "$FORCE" == "true" ]] && echo "--force" ) \
+        $( [[ "$SAVE_LATENCIES" == "true" ]] && echo "--save-latencies" ) \
+        $( [[ "$ADAPTIVE" == "true" ]] && echo "--adaptive" ); then
         echo "ERROR: Benchmark failed for $MODEL chunk_size=$CHUNK_SIZE" | tee -a "$RESULT_DIR/errors.log"
         BENCH_ERRORS=$((BENCH_ERRORS + 1))
     fi
@@ -18,6 +18,12 @@ MASTER_CONFIG="${MASTER_CONFIG:-"$SCRIPT_DIR/embedding-master.yaml"}"
 HF_TOKEN=${HF_TOKEN:?HF_TOKEN is required}
 HARDWARE=${HARDWARE:-unknown}
 FORCE=${FORCE:-false}
+ENCODING_FORMAT=${ENCODING_FORMAT:-"float"}  # float | base64
+# Must match ENCODING_SUFFIXES in result_naming.py
+ENC_SUFFIX=""
+if [[ "$ENCODING_FORMAT" == "base64" ]]; then
+    ENC_SUFFIX="__b64"
+fi
 
 # ── Parse models + sweep params from YAML ────────────────────────────────────
 # Emits one TSV line per model: hf_model <TAB> framework <TAB> chunk_sizes <TAB> batch_sizes <TAB> concurrencies
@@ -46,6 +52,7 @@ PYEOF
 
 echo "Config:    $MASTER_CONFIG"
 echo "Hardware:  $HARDWARE"
+echo "Encoding:  $ENCODING_FORMAT"
 echo "Models:    ${#MODEL_LINES[@]}"
 echo ""
 
@@ -64,7 +71,7 @@ for line in "${MODEL_LINES[@]}"; do
     # Skip if first-combo result file already exists
     model_slug="${hf_model//\//_}"
     result_dir="${RESULT_DIR:-"$SCRIPT_DIR/../results/${model_slug}__${HARDWARE}__${framework}"}"
-    first_result="${result_dir}/${model_slug}__chunk${first_chunk}__bs${first_batch}__conc${first_conc}.json"
+    first_result="${result_dir}/${model_slug}__chunk${first_chunk}__bs${first_batch}__conc${first_conc}${ENC_SUFFIX}.json"
 
     if [[ -f "$first_result" && "$FORCE" != "true" ]]; then
         echo ">>> Validation skip: $hf_model — first config already present"
@@ -80,6 +87,7 @@ for line in "${MODEL_LINES[@]}"; do
         BATCH_SIZES="$first_batch" \
         CONCURRENCIES="$first_conc" \
         NUM_REQUESTS="$num_requests" \
+        ENCODING_FORMAT="$ENCODING_FORMAT" \
         FORCE="$FORCE" \
         bash "$SCRIPT_DIR/run_bench.sh"; then
         echo ">>> VALIDATION FAILED: $hf_model ($framework)"
@@ -110,7 +118,7 @@ for line in "${MODEL_LINES[@]}"; do
     # Check if all expected result files already exist; skip server startup if so
     model_slug="${hf_model//\//_}"
     result_dir="${RESULT_DIR:-"$SCRIPT_DIR/../results/${model_slug}__${HARDWARE}__${framework}"}"
-    all_done=$(python3 - "$result_dir" "$chunk_sizes" "$batch_sizes" "$concurrencies" <<'PYEOF'
+    all_done=$(python3 - "$result_dir" "$chunk_sizes" "$batch_sizes" "$concurrencies" "$ENC_SUFFIX" <<'PYEOF'
 import sys, itertools
 from pathlib import Path
 
@@ -118,11 +126,12 @@ result_dir    = Path(sys.argv[1])
 chunk_sizes   = sys.argv[2].split(",")
 batch_sizes   = sys.argv[3].split(",")
 concurrencies = sys.argv[4].split(",")
+enc_suffix    = sys.argv[5]
 model_slug    = result_dir.name.split("__")[0]
 
 missing = []
 for cs, bs, c in itertools.product(chunk_sizes, batch_sizes, concurrencies):
-    fname = f"{model_slug}__chunk{cs}__bs{bs}__conc{c}.json"
+    fname = f"{model_slug}__chunk{cs}__bs{bs}__conc{c}{enc_suffix}.json"
     if not (result_dir / fname).exists():
         missing.append(fname)
 
@@ -144,6 +153,7 @@ PYEOF
         BATCH_SIZES="$batch_sizes" \
         CONCURRENCIES="$concurrencies" \
         NUM_REQUESTS="$num_requests" \
+        ENCODING_FORMAT="$ENCODING_FORMAT" \
         FORCE="$FORCE" \
         bash "$SCRIPT_DIR/run_bench.sh"; then
         echo ">>> FAILED: Model=$hf_model Framework=$framework"